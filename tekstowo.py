@@ -1,14 +1,32 @@
 # Necessary imports
 import argparse
+import asyncio
+import gzip
+import hashlib
+import json
+import logging
+import multiprocessing
 import os
+import random
+import re
+import shelve
+import socket
 import string
-import time
-from datetime import datetime
-from typing import Dict, List, Tuple
-
+import tempfile
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import date, datetime
+from functools import lru_cache
+from itertools import chain
+from typing import Dict, List, Optional, Tuple
+
+import aiohttp
 import langdetect
-import requests
-from bs4 import BeautifulSoup
+from selectolax.lexbor import LexborHTMLParser
+
+try:
+    import fasttext
+except ImportError:  # language detection falls back to langdetect
+    fasttext = None
 
 # Parser config
 parser = argparse.ArgumentParser(
@@ -24,16 +42,88 @@ parser.add_argument(
 parser.add_argument(
     "--save_progress",
     "--SAVE_PROGRESS",
-    help="Choose the interval of creating a save_progress file",
+    help="Choose the interval of creating a save_progress file, this is also \
+    the number of artists scraped together in one batch (default = 30)",
     default=30,
     type=int,
 )
+parser.add_argument(
+    "--lid_model",
+    "--LID_MODEL",
+    help="Path to the fastText language identification model, e.g. lid.176.ftz \
+    (default = lid.176.ftz, langdetect is used if the file is missing)",
+    default="lid.176.ftz",
+    type=str,
+)
+parser.add_argument(
+    "--verbose",
+    "--VERBOSE",
+    help="Log every visited page and saved song",
+    action="store_true",
+)
 
 args = parser.parse_args()
 
 # Config
 ARTIST_LETTER: str = args.letter
 SAVE_PROGRESS: int = args.save_progress  # interval of creating a save state file
+LID_MODEL: str = args.lid_model  # fastText language identification model
+MIN_SONG_LENGTH: int = 10  # songs not longer than this are not saved
+VERBOSE: bool = args.verbose  # per page and per song messages
+LANGUAGE_CHUNK_SIZE: int = 50  # songs per language detection task
+
+# Per page and per song messages, the debug ones are shown only with --verbose
+logger = logging.getLogger(__name__)
+
+# HTTP config
+REQUEST_TIMEOUT = aiohttp.ClientTimeout(total=60)
+MAX_CONNECTIONS: int = 32  # connection pool size of the shared session
+MAX_CONNECTIONS_PER_HOST: int = 4  # politeness limit towards tekstowo.pl
+KEEPALIVE_TIMEOUT: int = 60  # seconds an idle connection is kept open for reuse
+DNS_CACHE_TTL: int = 3600  # seconds the resolved tekstowo.pl address is reused
+USER_AGENT: str = (
+    "Mozilla/5.0 (compatible; speakleash-dedicated-web-crawlers; "
+    "+https://github.com/speakleash/speakleash-dedicated-web-crawlers)"
+)
+MAX_CONCURRENT_REQUESTS: int = 4  # requests in flight at the same time
+REQUEST_JITTER: Tuple[float, float] = (0.1, 0.3)  # delay before each request
+MAX_RETRIES: int = 5  # retries of a request after a transient failure
+RETRY_BACKOFF: float = 0.5  # seconds, doubled with every retry
+RETRY_STATUSES: Tuple[int, ...] = (429, 500, 502, 503, 504)
+MAX_RETRY_AFTER: int = 60  # seconds, cap of the pause asked by the server
+# Pages and their validators for conditional GET, kept per letter so that
+# different letters can be scraped at the same time (the same letter cannot)
+HTTP_CACHE_DIR: str = os.path.join("http_cache", ARTIST_LETTER.upper())
+
+# URL templates, formatted with the letter (and page number)
+BASE_URL: str = "https://tekstowo.pl"
+LETTER_URL = "https://www.tekstowo.pl/artysci_na,{0}.html".format
+LETTER_PAGE_URL = "https://www.tekstowo.pl/artysci_na,{0},strona,{1}.html".format
+
+# Page selectors, defined once and shared by all of the scraped pages
+PAGE_LINK_SELECTOR: str = ".page-link"
+ARTIST_LINK_SELECTOR: str = "a[href*='piosenki_']"
+ARTIST_NAME_SELECTOR: str = ".col-md-7.col-lg-8.px-0"
+SONG_LINK_SELECTOR: str = ".box-przeboje .title[href]"
+SONG_TITLE_SELECTOR: str = ".col-lg-7"
+SONG_TEXT_SELECTOR: str = ".inner-text"
+SONG_TRANSLATION_SELECTOR: str = "div#translation"
+
+# Song urls leading to malformed links or the "add lyrics" form
+EXCLUDED_SONG_URL = re.compile(r"\.plpiosenka|dodaj_tekst")
+
+# Shared by every request made to tekstowo.pl
+request_semaphore = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+
+# Event loop time before which no request is sent, set from Retry-After
+retry_not_before: float = 0.0
+
+# Single background thread writing the scraped songs to disk
+file_writer = ThreadPoolExecutor(max_workers=1)
+
+# Single background thread reading and writing the HTTP cache, so that cache
+# lookups do not queue behind the song writes
+cache_io = ThreadPoolExecutor(max_workers=1)
 
 # TODO:
 # create functions: save_progress, load_progress, continue_cycle - DONE
@@ -72,7 +162,166 @@ def processing_time(
     return days, hours, minutes, seconds
 
 
-def get_max_page_number(url: str) -> int:
+def create_session() -> aiohttp.ClientSession:
+    """
+    Creates the HTTP session shared by all of the scraping functions.
+    The connector limits the number of simultaneous connections
+    to the domain and keeps them alive, so consecutive requests
+    reuse already established TLS connections. The domain is resolved
+    (IPv4 only) once and kept in the DNS cache for the whole run.
+    """
+    connector = aiohttp.TCPConnector(
+        limit=MAX_CONNECTIONS,
+        limit_per_host=MAX_CONNECTIONS_PER_HOST,
+        keepalive_timeout=KEEPALIVE_TIMEOUT,
+        family=socket.AF_INET,
+        ttl_dns_cache=DNS_CACHE_TTL,
+    )
+
+    return aiohttp.ClientSession(
+        connector=connector, headers={"User-Agent": USER_AGENT}
+    )
+
+
+@lru_cache(maxsize=None)
+def open_http_cache() -> shelve.Shelf:
+    """
+    Opens the store of ETag/Last-Modified validators per cached page.
+    Only used from the 'cache_io' thread, closed at the end of the run.
+    """
+    os.makedirs(HTTP_CACHE_DIR, exist_ok=True)
+
+    return shelve.open(os.path.join(HTTP_CACHE_DIR, "validators"))
+
+
+def load_cached_page(url: str) -> Tuple[Dict[str, str], Optional[bytes]]:
+    """
+    Loads in the validators and the compressed content of a page saved
+    by 'save_cached_page'. Returns no validators if the page is missing
+    or cannot be read, so that it is downloaded again.
+    """
+    key = hashlib.sha256(url.encode("utf-8")).hexdigest()
+    page_file = os.path.join(HTTP_CACHE_DIR, f"{key}.html.gz")
+
+    try:
+        validators = open_http_cache().get(key)
+        if not validators or not os.path.isfile(page_file):
+            return {}, None
+
+        with open(page_file, "rb") as f:
+            return validators, gzip.decompress(f.read())
+    except Exception as e:
+        logger.warning("Cached page of %s is damaged, ignoring it: %r", url, e)
+        return {}, None
+
+
+def save_cached_page(url: str, content: bytes, validators: Dict[str, str]):
+    """
+    Saves the compressed content of a page along with the validators
+    the server sent for it. The page is written to a temporary file
+    first, so an interrupted write never leaves a truncated page behind.
+    Failures only cost the caching, the page itself is already fetched.
+    """
+    key = hashlib.sha256(url.encode("utf-8")).hexdigest()
+    page_file = os.path.join(HTTP_CACHE_DIR, f"{key}.html.gz")
+
+    try:
+        fd, tmp_file = tempfile.mkstemp(dir=HTTP_CACHE_DIR, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(gzip.compress(content))
+            os.replace(tmp_file, page_file)
+        except BaseException:
+            os.remove(tmp_file)
+            raise
+
+        open_http_cache()[key] = validators
+    except Exception as e:
+        logger.warning("Could not cache the page of %s: %r", url, e)
+
+
+async def fetch(session: aiohttp.ClientSession, url: str) -> bytes:
+    """
+    Downloads the content of a given url. The number of requests
+    in flight is capped by 'request_semaphore', a small random delay
+    spreads the requests in time. Pages fetched before are requested
+    conditionally and reused from the cache if not modified.
+    Transient failures are retried with an exponential backoff,
+    a Retry-After from the server pauses all of the requests.
+    """
+    global retry_not_before
+
+    # Cache reads and writes run on the cache thread, off the event loop
+    loop = asyncio.get_running_loop()
+    validators, cached_content = await loop.run_in_executor(
+        cache_io, load_cached_page, url
+    )
+
+    headers = {}
+    if "etag" in validators:
+        headers["If-None-Match"] = validators["etag"]
+    if "last_modified" in validators:
+        headers["If-Modified-Since"] = validators["last_modified"]
+
+    for attempt in range(MAX_RETRIES + 1):
+        try:
+            async with request_semaphore:
+                await asyncio.sleep(random.uniform(*REQUEST_JITTER))
+
+                # Respect the pause the server asked for in any response
+                pause = retry_not_before - loop.time()
+                if pause > 0:
+                    await asyncio.sleep(pause)
+
+                async with session.get(
+                    url, timeout=REQUEST_TIMEOUT, headers=headers
+                ) as response:
+                    if response.status == 304:
+                        return cached_content
+
+                    response.raise_for_status()
+                    content = await response.read()
+
+                    validators = {}
+                    if "ETag" in response.headers:
+                        validators["etag"] = response.headers["ETag"]
+                    if "Last-Modified" in response.headers:
+                        validators["last_modified"] = response.headers["Last-Modified"]
+            break
+        except aiohttp.ClientResponseError as e:
+            if e.status not in RETRY_STATUSES or attempt == MAX_RETRIES:
+                raise
+
+            # The server may tell how long to wait (in seconds)
+            delay = RETRY_BACKOFF * 2**attempt
+            retry_after = (e.headers or {}).get("Retry-After", "")
+            if retry_after.isdigit():
+                retry_after_delay = min(int(retry_after), MAX_RETRY_AFTER)
+                retry_not_before = max(
+                    retry_not_before, loop.time() + retry_after_delay
+                )
+                delay = max(delay, retry_after_delay)
+        except (
+            aiohttp.ClientConnectionError,
+            aiohttp.ClientPayloadError,
+            asyncio.TimeoutError,
+        ):
+            if attempt == MAX_RETRIES:
+                raise
+
+            delay = RETRY_BACKOFF * 2**attempt
+
+        logger.debug("Retrying %s in %ss", url, delay)
+        await asyncio.sleep(delay)
+
+    # Only pages the server can validate are worth caching
+    if validators:
+        cache_io.submit(save_cached_page, url, content, validators)
+
+    return content
+
+
+async def get_max_page_number(session: aiohttp.ClientSession, url: str) -> int:
     """
     Get the highest page number per given letter.
     Used in cooperation with 'create_lut_pagination'
@@ -82,24 +331,65 @@ def get_max_page_number(url: str) -> int:
     max_page = 0
 
     try:
-        req = requests.get(url, timeout=60)
-        req.raise_for_status()
-    except requests.exceptions.RequestException as e:
-        print(f"An error occured: {e}")
+        content = await fetch(session, url)
+    except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+        logger.warning("An error occured: %s", e)
         return max_page
 
-    if req.ok:
-        soup = BeautifulSoup(req.content, "lxml")
+    if content:
+        tree = LexborHTMLParser(content)
 
-        if soup:
-            for page in soup.find_all(class_="page-link"):
-                if page.text.isnumeric() and int(page.text) > max_page:
-                    max_page = int(page.text)
+        # Page links hold page numbers, apart from 'next' and 'previous'
+        page_numbers = (page.text() for page in tree.css(PAGE_LINK_SELECTOR))
+        max_page = max(
+            (int(number) for number in page_numbers if number.isnumeric()), default=0
+        )
 
     return max_page
 
 
-def create_lut_pagination() -> dict:
+def load_lut_pagination() -> Dict[str, int]:
+    """
+    Loads in today's look-up table of max page numbers per letter
+    saved by 'save_lut_pagination'. Returns an empty dict if there
+    is no such file.
+    """
+
+    lut_file = f"lut_{date.today().isoformat()}.json"
+
+    try:
+        with open(lut_file, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_lut_pagination(lut_pages: Dict[str, int]):
+    """
+    Saves the look-up table of max page numbers per letter, merged with
+    the entries already saved today. Letters without any pages found
+    are skipped, so that a failed request is retried on the next run.
+    The file is written to a temporary file first and then moved
+    into place.
+    """
+
+    lut_file = f"lut_{date.today().isoformat()}.json"
+
+    cached_lut = load_lut_pagination()
+    cached_lut.update({letter: pages for letter, pages in lut_pages.items() if pages})
+
+    # Moved into place in one step, so concurrent runs never read a partial file
+    fd, tmp_file = tempfile.mkstemp(dir=".", prefix="lut_", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(cached_lut, f)
+        os.replace(tmp_file, lut_file)
+    except BaseException:
+        os.remove(tmp_file)
+        raise
+
+
+async def create_lut_pagination(session: aiohttp.ClientSession) -> dict:
     """
     Creates a look-up table for each letter containing max page number
     per letter in 'alphabet' variable. By default these are all26 letters
@@ -109,22 +399,26 @@ def create_lut_pagination() -> dict:
 
     alphabet = list(string.ascii_uppercase) + ["pozostale"]
 
-    lut_pages = {}
+    # Pagination rarely changes within a day
+    lut_pages = load_lut_pagination()
+    if all(letter in lut_pages for letter in alphabet):
+        return lut_pages
 
     for letter in alphabet:
-        time.sleep(1)
-        url = f"https://www.tekstowo.pl/artysci_na,{letter}.html"
+        url = LETTER_URL(letter)
 
         try:
-            lut_pages[letter] = get_max_page_number(url)
+            lut_pages[letter] = await get_max_page_number(session, url)
             print(f"Letter {letter} has {lut_pages[letter]} pages of artists.")
         except Exception as e:
             print(f"An error has occured for letter {letter}: {e}")
 
+    save_lut_pagination(lut_pages)
+
     return lut_pages
 
 
-def pages_per_letter(ARTIST_LETTER: str) -> dict:
+async def pages_per_letter(session: aiohttp.ClientSession, ARTIST_LETTER: str) -> dict:
     """
     Returns the value of the last page containing the songs
     per artist.
@@ -135,19 +429,43 @@ def pages_per_letter(ARTIST_LETTER: str) -> dict:
     if len(ARTIST_LETTER) < 2:
         ARTIST_LETTER = ARTIST_LETTER.upper()
 
-    url = f"https://www.tekstowo.pl/artysci_na,{ARTIST_LETTER}.html"
+    lut_pages = load_lut_pagination()
+    if ARTIST_LETTER in lut_pages:
+        letter_max_page = lut_pages[ARTIST_LETTER]
+        print(f"Letter {ARTIST_LETTER} has {letter_max_page} pages of artists.")
+        return letter_max_page
+
+    url = LETTER_URL(ARTIST_LETTER)
 
     try:
-        letter_max_page = get_max_page_number(url)
+        letter_max_page = await get_max_page_number(session, url)
         print(f"Letter {ARTIST_LETTER} has {letter_max_page} pages of artists.")
     except Exception as e:
         print(f"An error has occured for letter {ARTIST_LETTER}: {e}")
 
+    save_lut_pagination({ARTIST_LETTER: letter_max_page})
+
     return letter_max_page
 
 
-def get_artists(
-    ARTIST_LETTER: str, max_page_per_letter: Dict[str, int] or int
+async def get_artists_page(session: aiohttp.ClientSession, url: str) -> List[str]:
+    """
+    Scrape the artist urls from a single page of the artists list.
+    The page is parsed as soon as it is downloaded, so only the
+    extracted urls are kept in memory.
+    """
+    content = await fetch(session, url)
+    tree = LexborHTMLParser(content)
+
+    return [
+        BASE_URL + link.attributes["href"] for link in tree.css(ARTIST_LINK_SELECTOR)
+    ]
+
+
+async def get_artists(
+    session: aiohttp.ClientSession,
+    ARTIST_LETTER: str,
+    max_page_per_letter: Dict[str, int] or int,
 ) -> Tuple[List[str], int]:
     """
     Scrape all of the artists starting with a given letter in the alphabet.
@@ -166,22 +484,20 @@ def get_artists(
             integer value."
         )
 
-    for page in range(1, limit + 1):
-        url = f"https://www.tekstowo.pl/artysci_na,{ARTIST_LETTER},strona,{page}.html"
+    page_urls = [LETTER_PAGE_URL(ARTIST_LETTER, page) for page in range(1, limit + 1)]
 
-        try:
-            time.sleep(2)
-            response = requests.get(url, timeout=60)
-            if response.ok:
-                soup = BeautifulSoup(response.content, "lxml")
-                for link in soup.find_all("a"):
-                    item = link.get("href")
-                    if isinstance(item, str) and "piosenki_" in item:
-                        urls.append("https://tekstowo.pl" + item)
-        except Exception as e:
-            print(e)
+    # Download and parse all of the pages concurrently, the connector
+    # caps the number of simultaneous connections
+    pages = await asyncio.gather(
+        *(get_artists_page(session, url) for url in page_urls),
+        return_exceptions=True,
+    )
 
-        print(f"{ARTIST_LETTER}: Visited {page}/{limit}")
+    for page, artist_urls in enumerate(pages, start=1):
+        if isinstance(artist_urls, Exception):
+            logger.warning("%s: page %s failed: %s", ARTIST_LETTER, page, artist_urls)
+        else:
+            urls.extend(artist_urls)
 
     print(
         f"{generate_timestamp()}: Letter {ARTIST_LETTER}: collected {len(urls)} artists"
@@ -191,102 +507,173 @@ def get_artists(
     return urls, len(urls)
 
 
-def get_artist_songs(artist_url: str) -> list:
+async def get_artist_songs(session: aiohttp.ClientSession, artist_url: str) -> list:
     """
     Extract all the songs from a given artist.
     """
     urls = []
+    seen_urls = set()  # constant time lookup of already collected urls
+    artist = None
     processed_first_page = False
 
     while not processed_first_page:
-        time.sleep(5)
         try:
-            response = requests.get(artist_url, timeout=60)
-
-            # Check for request success
-            response.raise_for_status()
-
-            soup = BeautifulSoup(response.content, "html.parser")
-            songs = soup.find_all(class_="box-przeboje")
-            artist = soup.find(class_="col-md-7 col-lg-8 px-0")
-            artist = artist.text.split(" (")[0].strip()
-
-            for song in songs:
-                song_title_element = song.find(class_="title")
-
-                if song_title_element:
-                    if artist in song_title_element.text.strip():
-                        song_url = "https://tekstowo.pl" + song_title_element["href"]
-                        if (
-                            not ".plpiosenka" in song_url
-                            and song_url not in urls
-                            and not "dodaj_tekst" in song_url
-                        ):
-                            urls.append(song_url)
-
-            button_next_page = soup.find_all(class_="page-link")
+            # Raises for unsuccessful requests
+            content = await fetch(session, artist_url)
+
+            tree = LexborHTMLParser(content)
+            # Song title links with a target, matched by the parser itself
+            song_title_elements = tree.css(SONG_LINK_SELECTOR)
+
+            # The artist is the same on every page, read it only once
+            if artist is None:
+                artist = tree.css_first(ARTIST_NAME_SELECTOR)
+                artist = artist.text().split(" (")[0].strip()
+
+            for song_title_element in song_title_elements:
+                if artist in song_title_element.text().strip():
+                    song_url = BASE_URL + song_title_element.attributes["href"]
+                    excluded = EXCLUDED_SONG_URL.search(song_url)
+                    if not excluded and song_url not in seen_urls:
+                        seen_urls.add(song_url)
+                        urls.append(song_url)
+
+            button_next_page = tree.css(PAGE_LINK_SELECTOR)
             if button_next_page and len(button_next_page) > 0:
                 button_next_page = button_next_page[-1]
 
-                if "następna" in button_next_page.text.lower():
-                    artist_url = "https://tekstowo.pl" + button_next_page["href"]
+                if "następna" in button_next_page.text().lower():
+                    artist_url = BASE_URL + button_next_page.attributes["href"]
                 else:
                     break
             else:
                 break
-        except requests.exceptions.RequestException as e:
-            print(f"An error occurred during the HTTP request: {e}")
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            logger.warning("An error occurred during the HTTP request: %s", e)
             return False
         except Exception as e:
-            print(f"An unexpected error occurred: {e}")
+            logger.warning("An unexpected error occurred: %s", e)
             return False
 
-    print(f"Artist {artist}, collected {len(urls)} song URLs")
+    logger.debug("Artist %s, collected %s song URLs", artist, len(urls))
     return urls
 
 
-def extract_song(song_url: str) -> Tuple[str, str, str]:
+@lru_cache(maxsize=None)
+def get_parser_pool() -> ProcessPoolExecutor:
+    """
+    Creates the worker processes parsing the song pages on all of
+    the cores. The workers are not forked from the running event loop
+    and its threads, but started fresh (forkserver where available,
+    spawn otherwise). Created on first use, so that the workers
+    importing this script do not create pools of their own.
+    """
+    start_methods = multiprocessing.get_all_start_methods()
+    start_method = "forkserver" if "forkserver" in start_methods else "spawn"
+
+    return ProcessPoolExecutor(
+        max_workers=os.cpu_count(),
+        mp_context=multiprocessing.get_context(start_method),
+    )
+
+
+def parse_song_page(content: bytes) -> Tuple[str, str, str]:
     """
     Scrapes the song (and song_translation if found) and its
-    title from a given song_url.
+    title from the content of a song page. Runs in 'get_parser_pool'
+    worker processes.
     """
 
     song = ""
     song_translation = None
+    song_title = ""
 
     try:
-        response = requests.get(song_url, timeout=60)
-        if response.ok:
-            # Scrape URL content with BeautifulSoup
-            soup = BeautifulSoup(response.content, "lxml")
+        if content:
+            # Scrape URL content with selectolax
+            tree = LexborHTMLParser(content)
 
             # Song title
-            song_title = soup.find(class_="col-lg-7").text.strip()
+            song_title = tree.css_first(SONG_TITLE_SELECTOR).text().strip()
 
             # Original song
-            song_html = soup.find(class_="inner-text")
-            song = song_html.text.strip()
+            song_html = tree.css_first(SONG_TEXT_SELECTOR)
+            song = song_html.text().strip()
 
             # Translated version
-            transl_html = soup.find("div", id="translation")
-            song_translation = transl_html.text.strip().split("\t\t")[0]
+            transl_html = tree.css_first(SONG_TRANSLATION_SELECTOR)
+            song_translation = transl_html.text().strip().split("\t\t")[0]
     except Exception as e:
-        print(e)
+        # Mostly songs without a translation
+        logger.debug("Incomplete song page: %s", e)
 
     return song, song_translation, song_title
 
 
-def assess_language(song_text: str) -> str:
+async def extract_song(
+    session: aiohttp.ClientSession, song_url: str
+) -> Tuple[str, str, str]:
     """
-    Detect the language of provided song.
+    Scrapes the song (and song_translation if found) and its
+    title from a given song_url.
     """
-    if not isinstance(song_text, str):
-        return False
 
     try:
-        return langdetect.detect(song_text)
-    except langdetect.lang_detect_exception.LangDetectException:
-        return False
+        content = await fetch(session, song_url)
+    except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+        logger.warning("Song %s failed: %s", song_url, e)
+        return "", None, ""
+
+    # Parsing is CPU bound, hand it over to the worker processes
+    loop = asyncio.get_running_loop()
+
+    return await loop.run_in_executor(get_parser_pool(), parse_song_page, content)
+
+
+@lru_cache(maxsize=None)
+def load_language_model():
+    """
+    Loads the fastText language identification model once.
+    Returns None if fastText or the model file is not available.
+    """
+    if fasttext is None or not os.path.isfile(LID_MODEL):
+        return None
+
+    return fasttext.load_model(LID_MODEL)
+
+
+def assess_languages(song_texts: List[str], min_length: int = 0) -> List[str]:
+    """
+    Detect the language of each of provided songs. With the fastText
+    model loaded all of the songs are classified in a single call.
+    Songs not longer than 'min_length' are skipped.
+    """
+    langs = [False] * len(song_texts)
+    valid = [
+        i
+        for i, text in enumerate(song_texts)
+        if isinstance(text, str) and text.strip() and len(text) > min_length
+    ]
+
+    lid_model = load_language_model()
+
+    if lid_model is not None:
+        # fastText expects single line inputs
+        labels, _ = lid_model.predict(
+            [song_texts[i].replace("\n", " ") for i in valid], k=1
+        )
+        for i, label in zip(valid, labels):
+            langs[i] = label[0].replace("__label__", "")
+
+        return langs
+
+    for i in valid:
+        try:
+            langs[i] = langdetect.detect(song_texts[i])
+        except langdetect.lang_detect_exception.LangDetectException:
+            pass
+
+    return langs
 
 
 def save_songs(
@@ -305,7 +692,11 @@ def save_songs(
     clean_title = title.replace("/", "-")
 
     # Original song
-    if isinstance(lang_1, str) and len(lang_1) < 3 and len(original_song) > 10:
+    if (
+        isinstance(lang_1, str)
+        and len(lang_1) < 3
+        and len(original_song) > MIN_SONG_LENGTH
+    ):
         original_song_filename = f"{clean_title}__{lang_1.upper()}.txt"
 
         # Save to a file
@@ -313,12 +704,16 @@ def save_songs(
             os.path.join(save_dir, original_song_filename), "w", encoding="utf-8"
         ) as f:
             f.write(original_song)
-            print(f"{generate_timestamp()}: Original successfully saved: {title}")
+            logger.debug("Original successfully saved: %s", title)
     else:
-        print(f"{generate_timestamp()}: Song {title} is too short or has no text.")
+        logger.debug("Song %s is too short or has no text.", title)
 
     # Translated song
-    if isinstance(lang_2, str) and len(lang_2) < 3 and len(translated_song) > 10:
+    if (
+        isinstance(lang_2, str)
+        and len(lang_2) < 3
+        and len(translated_song) > MIN_SONG_LENGTH
+    ):
         translated_song_filename = f"{clean_title}__TRAN__{lang_2.upper()}.txt"
 
         # Save to a file
@@ -326,9 +721,32 @@ def save_songs(
             os.path.join(save_dir, translated_song_filename), "w", encoding="utf-8"
         ) as f:
             f.write(translated_song)
-            print(f"{generate_timestamp()}: Translation successfully saved: {title}")
+            logger.debug("Translation successfully saved: %s", title)
     else:
-        print(f"{generate_timestamp()}: Translation not found or empty.")
+        logger.debug("Translation not found or empty.")
+
+
+def report_write_error(future: Future):
+    """
+    Logs the error raised while saving songs in the writer thread.
+    """
+    if future.exception():
+        logger.warning("An error occured: %s", future.exception())
+
+
+def queue_save_songs(
+    title: str, original_song: str, translated_song: str, lang_1: str, lang_2: str
+) -> Future:
+    """
+    Hands the songs over to the writer thread, so that writing
+    the files does not block the scraping.
+    """
+    future = file_writer.submit(
+        save_songs, title, original_song, translated_song, lang_1, lang_2
+    )
+    future.add_done_callback(report_write_error)
+
+    return future
 
 
 def save_progress(ARTIST_LETTER: str, artist_url: str):
@@ -364,7 +782,73 @@ def load_progress(ARTIST_LETTER: str):
         return False
 
 
-def main_cycle(ARTIST_LETTER: str):
+async def process_artists(session: aiohttp.ClientSession, artist_urls: List[str]):
+    """
+    Scrapes the songs of a batch of artists stage by stage: song URLs
+    of all the artists, then all of the song pages, language detection
+    on the worker processes and finally saving the files. Returns once
+    all of the files are written, so that the progress can be saved.
+    """
+    # Collect all song URLs of the artists
+    artist_songs = await asyncio.gather(
+        *(get_artist_songs(session, artist_url) for artist_url in artist_urls),
+        return_exceptions=True,
+    )
+    for artist_url, songs in zip(artist_urls, artist_songs):
+        if isinstance(songs, Exception):
+            logger.warning("Artist %s failed: %r", artist_url, songs)
+    song_urls = list(
+        chain.from_iterable(songs for songs in artist_songs if isinstance(songs, list))
+    )
+
+    # Extract lyrics of all the songs
+    extracted_songs = await asyncio.gather(
+        *(extract_song(session, song_url) for song_url in song_urls),
+        return_exceptions=True,
+    )
+    for song_url, song in zip(song_urls, extracted_songs):
+        if isinstance(song, Exception):
+            logger.warning("Song %s failed: %r", song_url, song)
+    extracted_songs = [song for song in extracted_songs if isinstance(song, tuple)]
+
+    originals = [original for original, _, _ in extracted_songs]
+    translations = [translation for _, translation, _ in extracted_songs]
+    titles = [title for _, _, title in extracted_songs]
+
+    # Check the lyrics' language in chunks on the worker processes, originals
+    # and translations together, songs too short to be saved are skipped
+    song_texts = originals + translations
+    loop = asyncio.get_running_loop()
+    chunk_langs = await asyncio.gather(
+        *(
+            loop.run_in_executor(
+                get_parser_pool(),
+                assess_languages,
+                song_texts[i : i + LANGUAGE_CHUNK_SIZE],
+                MIN_SONG_LENGTH,
+            )
+            for i in range(0, len(song_texts), LANGUAGE_CHUNK_SIZE)
+        )
+    )
+    langs = list(chain.from_iterable(chunk_langs))
+    original_langs = langs[: len(originals)]
+    translation_langs = langs[len(originals) :]
+
+    # Save songs to txt files
+    writes = [
+        queue_save_songs(title, text1, text2, lang1, lang2)
+        for title, text1, text2, lang1, lang2 in zip(
+            titles, originals, translations, original_langs, translation_langs
+        )
+    ]
+
+    # Write errors are already reported by 'report_write_error'
+    await asyncio.gather(
+        *(asyncio.wrap_future(write) for write in writes), return_exceptions=True
+    )
+
+
+async def main_cycle(session: aiohttp.ClientSession, ARTIST_LETTER: str):
     """
     Main script cycle - fresh letter, no continuation
     """
@@ -372,42 +856,28 @@ def main_cycle(ARTIST_LETTER: str):
     cnt = 0
 
     # Get max page per given letter
-    max_page = pages_per_letter(ARTIST_LETTER)
+    max_page = await pages_per_letter(session, ARTIST_LETTER)
 
     # Collect all artists per given letter
-    artist_urls, artist_cnt = get_artists(ARTIST_LETTER, max_page)
+    artist_urls, artist_cnt = await get_artists(session, ARTIST_LETTER, max_page)
 
-    # Go through every artist in the URL list
-    for artist_url in artist_urls:
-        # Collect all song URLs per artist
-        artist_songs = get_artist_songs(artist_url)
+    # Go through the artists in batches of SAVE_PROGRESS
+    for i in range(0, len(artist_urls), SAVE_PROGRESS):
+        artist_batch = artist_urls[i : i + SAVE_PROGRESS]
 
         try:
-            # Delay
-            time.sleep(5)
-
-            # Go through all song URLs
-            for artist_song in artist_songs:
-                # Extract lyrics of given song
-                text1, text2, title = extract_song(artist_song)
-
-                # Check the lyrics' language
-                lang1 = assess_language(text1)
-                lang2 = assess_language(text2)
-
-                # Save songs to txt file
-                save_songs(title, text1, text2, lang1, lang2)
+            await process_artists(session, artist_batch)
         except Exception as e:
             print(f"An error occured: {e}")
 
         # Artist per letter counter
-        cnt += 1
+        cnt += len(artist_batch)
         print(
             f"{generate_timestamp()} : Letter {ARTIST_LETTER}, processed {cnt}/{artist_cnt}"
         )
 
         # Save current progress
-        if save_progress(ARTIST_LETTER, artist_url) and cnt % SAVE_PROGRESS == 0:
+        if save_progress(ARTIST_LETTER, artist_batch[-1]):
             print(f"Progress saved to file - {ARTIST_LETTER}_progress.txt")
 
     # Finish the cycle
@@ -421,7 +891,7 @@ def main_cycle(ARTIST_LETTER: str):
     return True
 
 
-def continue_cycle(ARTIST_LETTER: str):
+async def continue_cycle(session: aiohttp.ClientSession, ARTIST_LETTER: str):
     """
     Reads in the last visited URL and continues from this onwards.
     If there is no progress_file, starts the scraping from scratch.
@@ -431,16 +901,16 @@ def continue_cycle(ARTIST_LETTER: str):
 
     if not last_url:
         print("No progress file found, starting from scratch")
-        main_cycle(ARTIST_LETTER)
+        await main_cycle(session, ARTIST_LETTER)
 
     else:
         start_timestamp = datetime.now()
 
         # Get max page per given letter
-        max_page = pages_per_letter(ARTIST_LETTER)
+        max_page = await pages_per_letter(session, ARTIST_LETTER)
 
         # Collect all artists per given letter
-        artist_urls, artist_cnt = get_artists(ARTIST_LETTER, max_page)
+        artist_urls, artist_cnt = await get_artists(session, ARTIST_LETTER, max_page)
 
         # Check where to start from
         item_no = artist_urls.index(last_url, 0, len(artist_urls))
@@ -453,31 +923,17 @@ def continue_cycle(ARTIST_LETTER: str):
             Processed URLs: {item_no}\nURLs left: {len(artist_urls_left) - item_no}"
         )
 
-        # Go through every artist in the URL list
-        for artist_url in artist_urls_left:
-            # Collect all song URLs per artist
-            artist_songs = get_artist_songs(artist_url)
+        # Go through the artists in batches of SAVE_PROGRESS
+        for i in range(0, len(artist_urls_left), SAVE_PROGRESS):
+            artist_batch = artist_urls_left[i : i + SAVE_PROGRESS]
 
             try:
-                # Delay
-                time.sleep(5)
-
-                # Go through all song URLs
-                for artist_song in artist_songs:
-                    # Extract lyrics of given song
-                    text1, text2, title = extract_song(artist_song)
-
-                    # Check the lyrics' language
-                    lang1 = assess_language(text1)
-                    lang2 = assess_language(text2)
-
-                    # Save songs to txt file
-                    save_songs(title, text1, text2, lang1, lang2)
+                await process_artists(session, artist_batch)
             except Exception as e:
                 print(f"An error occured: {e}")
 
             # Artist per letter counter
-            cnt += 1
+            cnt += len(artist_batch)
             print(
                 f"{generate_timestamp()} : Letter {ARTIST_LETTER}, processed {cnt}/{artist_cnt}"
             )
@@ -493,5 +949,31 @@ def continue_cycle(ARTIST_LETTER: str):
         return True
 
 
+async def run(ARTIST_LETTER: str):
+    """
+    Opens the HTTP session shared by the whole run and continues
+    the scraping of a given letter.
+    """
+    try:
+        async with create_session() as session:
+            await continue_cycle(session, ARTIST_LETTER)
+    finally:
+        # Wait for the remaining songs to be written
+        file_writer.shutdown(wait=True)
+        get_parser_pool().shutdown(wait=True)
+        # Wait for the remaining cache entries before closing the cache
+        cache_io.shutdown(wait=True)
+        open_http_cache().close()
+
+
 if __name__ == "__main__":
-    continue_cycle(ARTIST_LETTER)
+    logging.basicConfig(
+        format="%(asctime)s: %(message)s",
+        datefmt="%Y-%m-%d, %H:%M:%S",
+        level=logging.WARNING,
+    )
+
+    # Debug messages of this script only, not of asyncio or aiohttp
+    if VERBOSE:
+        logger.setLevel(logging.DEBUG)
+    asyncio.run(run(ARTIST_LETTER))